@@ -1,6 +1,61 @@
+import asyncio
+import csv
+import shelve
+import time
+import aiohttp
+import simdjson
+from aiolimiter import AsyncLimiter
 from amadeus import Client, ResponseError
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+
+COLUMNS = ('Currency', 'Price', 'Date', 'Stops', 'IATA_Origin', 'IATA_Destination',
+           'Duration', 'IATA1_Origin', 'IATA1_Destination', 'Duration1',
+           'Total_Duration')
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB block buffer for the output CSV
+
+BASE_URL = 'https://test.api.amadeus.com'
+TOKEN_URL = BASE_URL + '/v1/security/oauth2/token'
+OFFERS_URL = BASE_URL + '/v2/shopping/flight-offers'
+N_CONCURRENT = 16  # in-flight requests allowed at once
+REQUESTS_PER_SECOND = 10  # Amadeus self-service rate cap
+MAX_RETRIES = 5
+KEEPALIVE_TIMEOUT = 30  # seconds an idle pooled connection survives between requests
+
+CACHE_PATH = '.amadeus_cache'
+CACHE_TTL = 86400  # seconds a cached search stays fresh, to respect fare freshness
+
+
+class OfferRow:
+    """
+    A fixed-slot record holding one filtered flight offer, in COLUMNS order.
+
+    __slots__ keeps each row to a compact attribute table instead of a
+    per-row dict; as_tuple feeds the csv writer directly.
+    """
+    __slots__ = ('currency', 'price', 'date', 'stops', 'iata_origin', 'iata_destination',
+                 'duration', 'iata1_origin', 'iata1_destination', 'duration1',
+                 'total_duration')
+
+    def __init__(self, currency, price, date, stops, iata_origin, iata_destination,
+                 duration, iata1_origin, iata1_destination, duration1, total_duration):
+        self.currency = currency
+        self.price = price
+        self.date = date
+        self.stops = stops
+        self.iata_origin = iata_origin
+        self.iata_destination = iata_destination
+        self.duration = duration
+        self.iata1_origin = iata1_origin
+        self.iata1_destination = iata1_destination
+        self.duration1 = duration1
+        self.total_duration = total_duration
+
+    def as_tuple(self):
+        return (self.currency, self.price, self.date, self.stops,
+                self.iata_origin, self.iata_destination, self.duration,
+                self.iata1_origin, self.iata1_destination, self.duration1,
+                self.total_duration)
 
 
 class AmadeusOperator:
@@ -19,33 +74,41 @@ class AmadeusOperator:
             client_id=amadeus_api_key,
             client_secret=amadeus_api_secret
         )
+        self.amadeus_api_key = amadeus_api_key
+        self.amadeus_api_secret = amadeus_api_secret
+        self._token = None
+        self._token_lock = asyncio.Lock()
+        self._json_parser = simdjson.Parser()
+        self._cache = shelve.open(CACHE_PATH)
         return
 
-    def get_flight_offers(self, origin, destination, departure_date, filepath, adults=1):
+    def get_flight_offers(self, origin, destination, departure_date, writer, adults=1):
         """
         Retrieves the cheapest flight offers for a given journey.
 
         Parameters:
         origin (str): The IATA code for the origin city/airport.
         destination (str): The IATA code for the destination city/airport.
-        departure_date (str): The departure date in the format 'YYYY-MM-DD'.
+        departure_date (datetime.date): The departure date.
+        writer (csv.writer): The writer the flight offers are appended to.
         adults (int, optional): The number of adult passengers. Default is 1.
 
         Returns:
-        list: A list of flight offers if available, otherwise an empty list.
+        list or None: A list of OfferRow records for the filtered offers
+        (possibly empty), or None if the request failed.
         """
-        # Check if the departure date is before today's date
-        departure_date_obj = datetime.strptime(departure_date, '%Y-%m-%d').date()
-        today_date = datetime.today().date()
-        if departure_date_obj < today_date:
-            print(f"Error: Departure date {departure_date} is in the past.")
-            return None
+        cache_key = self._cache_key(origin, destination, departure_date.isoformat(), adults)
+        cached_rows = self._cache_get(cache_key)
+        if cached_rows is not None:
+            if cached_rows:
+                writer.writerows(row.as_tuple() for row in cached_rows)
+            return cached_rows
 
         try:
             response = self.amadeus.shopping.flight_offers_search.get(
                 originLocationCode=origin,
                 destinationLocationCode=destination,
-                departureDate=departure_date,
+                departureDate=departure_date.isoformat(),
                 adults=adults
             )
 
@@ -53,10 +116,11 @@ class AmadeusOperator:
             offer_lst = response.result['data']
 
             # Processing
-            df = pd.DataFrame()
-            df = self._add_offers_to_df(df, offer_lst, max_price=400)
-            df.to_csv(filepath, mode='a', header=False, index=False)
-            return offer_lst
+            rows = self._offers_to_rows(offer_lst, max_price=400)
+            self._cache_put(cache_key, rows)
+            if rows:
+                writer.writerows(row.as_tuple() for row in rows)
+            return rows
 
         except ResponseError as e:
             print(f"An error occurred: {e}\nDeparture: {origin}. Destination: {destination}")
@@ -75,11 +139,17 @@ class AmadeusOperator:
         filepath (str): The path to the file where the flight offers will be stored or processed.
         adults (int, optional): The number of adult passengers. Default is 1.
         """
-        current_date = start_date
-        while current_date <= end_date:
-            current_date_formatted = current_date.strftime('%Y-%m-%d')
-            self.get_flight_offers(origin, destination, departure_date=current_date_formatted, filepath=filepath, adults=adults)
-            current_date += timedelta(days=1)
+        # Past departure dates are skipped up front so the per-request path
+        # never has to re-check the calendar
+        today_date = date.today()
+        if start_date < today_date:
+            print(f"Error: Departure dates before {today_date} are in the past.")
+        with open(filepath, 'a', buffering=WRITE_BUFFER_SIZE, newline='') as fh:
+            writer = csv.writer(fh)
+            current_date = max(start_date, today_date)
+            while current_date <= end_date:
+                self.get_flight_offers(origin, destination, departure_date=current_date, writer=writer, adults=adults)
+                current_date += timedelta(days=1)
         return
 
     def get_flights_across_destinations(self, origin, destination_lst, start_date, end_date, filepath, adults=1):
@@ -94,9 +164,8 @@ class AmadeusOperator:
         filepath (str): The path to the file where the flight offers will be stored or processed.
         adults (int, optional): The number of adult passengers. Default is 1.
         """
-        for destination in destination_lst:
-            self.get_flights_within_dates(origin, destination, start_date, end_date, filepath, adults=adults)
-            print(f"{origin} - {destination} is retrieved.")
+        pairs = [(origin, destination) for destination in destination_lst]
+        asyncio.run(self._search_pairs(pairs, start_date, end_date, filepath, adults=adults))
         return
 
     def get_flights_across_origins(self, origin_lst, destination, start_date, end_date, filepath, adults=1):
@@ -111,68 +180,273 @@ class AmadeusOperator:
         filepath (str): The path to the file where the flight offers will be stored or processed.
         adults (int, optional): The number of adult passengers. Default is 1.
         """
-        for origin in origin_lst:
-            self.get_flights_within_dates(origin, destination, start_date, end_date, filepath, adults=adults)
+        pairs = [(origin, destination) for origin in origin_lst]
+        asyncio.run(self._search_pairs(pairs, start_date, end_date, filepath, adults=adults))
+        return
+
+    async def _search_pairs(self, pairs, start_date, end_date, filepath, adults=1):
+        """
+        Fans out flight-offer searches over (origin, destination) pairs x dates concurrently.
+        All requests share one aiohttp session; the results are appended to the filepath
+        by a single writer task consuming a queue, so concurrent searches never
+        interleave their CSV output.
+
+        Parameters:
+        pairs (list): A list of (origin, destination) IATA code tuples.
+        start_date (datetime.date): The starting date of the date range.
+        end_date (datetime.date): The ending date of the date range.
+        filepath (str): The path to the file where the flight offers will be stored or processed.
+        adults (int, optional): The number of adult passengers. Default is 1.
+        """
+        # Past departure dates are dropped once here instead of per request
+        today_date = date.today()
+        if start_date < today_date:
+            print(f"Error: Departure dates before {today_date} are in the past.")
+        dates = []
+        current_date = max(start_date, today_date)
+        while current_date <= end_date:
+            dates.append(current_date.isoformat())
+            current_date += timedelta(days=1)
+
+        queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(N_CONCURRENT)
+        limiter = AsyncLimiter(REQUESTS_PER_SECOND, 1)
+
+        async def search_one(session, origin, destination, departure_date):
+            cache_key = self._cache_key(origin, destination, departure_date, adults)
+            rows = self._cache_get(cache_key)
+            if rows is None:
+                raw = await self._fetch_offers(session, semaphore, limiter,
+                                               origin, destination, departure_date, adults=adults)
+                if raw is None:
+                    return
+                # The lazy offers reference the shared parser's buffer, so they
+                # must be consumed before the next parse (no await in between)
+                rows = self._offers_to_rows(self._parse_offers(raw), max_price=400)
+                self._cache_put(cache_key, rows)
+            if rows:
+                await queue.put(rows)
+
+        async def search_pair(session, origin, destination):
+            await asyncio.gather(*(search_one(session, origin, destination, departure_date)
+                                   for departure_date in dates))
             print(f"{origin} - {destination} is retrieved.")
+
+        async def write_rows():
+            with open(filepath, 'a', buffering=WRITE_BUFFER_SIZE, newline='') as fh:
+                writer = csv.writer(fh)
+                while True:
+                    rows = await queue.get()
+                    if rows is None:
+                        break
+                    writer.writerows(row.as_tuple() for row in rows)
+
+        # Pooled keep-alive connections amortize the TLS handshake across
+        # every request of the batch instead of paying it per search
+        connector = aiohttp.TCPConnector(limit=N_CONCURRENT, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector,
+                                         headers={'Connection': 'keep-alive'}) as session:
+            writer_task = asyncio.create_task(write_rows())
+            await asyncio.gather(*(search_pair(session, origin, destination)
+                                   for origin, destination in pairs))
+            await queue.put(None)
+            await writer_task
         return
 
+    async def _get_token(self, session):
+        """
+        Returns the cached OAuth2 access token, requesting a new one when absent.
+
+        Parameters:
+        session (aiohttp.ClientSession): The session used for the token request.
+
+        Returns:
+        str: A bearer token for the Amadeus API.
+        """
+        if self._token is None:
+            async with self._token_lock:
+                # Re-check after acquiring: another coroutine may have refreshed it
+                if self._token is None:
+                    async with session.post(TOKEN_URL, data={
+                        'grant_type': 'client_credentials',
+                        'client_id': self.amadeus_api_key,
+                        'client_secret': self.amadeus_api_secret,
+                    }) as response:
+                        response.raise_for_status()
+                        payload = await response.json()
+                        self._token = payload['access_token']
+        return self._token
+
+    async def _fetch_offers(self, session, semaphore, limiter, origin, destination, departure_date, adults=1):
+        """
+        Fetches flight offers for a single journey, retrying on rate limits and server errors.
+
+        Parameters:
+        session (aiohttp.ClientSession): The shared session.
+        semaphore (asyncio.Semaphore): Bounds the number of in-flight requests.
+        limiter (aiolimiter.AsyncLimiter): Caps the request rate per second.
+        origin (str): The IATA code for the origin city/airport.
+        destination (str): The IATA code for the destination city/airport.
+        departure_date (str): The departure date in the format 'YYYY-MM-DD'.
+        adults (int, optional): The number of adult passengers. Default is 1.
+
+        Returns:
+        bytes or None: The raw JSON response body if available, otherwise None.
+        """
+        params = {
+            'originLocationCode': origin,
+            'destinationLocationCode': destination,
+            'departureDate': departure_date,
+            'adults': adults,
+        }
+        for attempt in range(MAX_RETRIES):
+            retry_delay = float(2 ** attempt)
+            try:
+                async with semaphore:
+                    async with limiter:
+                        token = await self._get_token(session)
+                        async with session.get(OFFERS_URL, params=params,
+                                               headers={'Authorization': f'Bearer {token}'}) as response:
+                            if response.status == 401:
+                                # Token expired; refresh and retry immediately
+                                self._token = None
+                                continue
+                            if response.status == 429 or response.status >= 500:
+                                try:
+                                    retry_delay = float(response.headers['Retry-After'])
+                                except (KeyError, ValueError):
+                                    # Absent, or the HTTP-date form; keep the exponential delay
+                                    pass
+                            elif response.status != 200:
+                                body = await response.text()
+                                print(f"An error occurred: {response.status} {body}\n"
+                                      f"Departure: {origin}. Destination: {destination}")
+                                return None
+                            else:
+                                return await response.read()
+            except aiohttp.ClientError as e:
+                # Transient network failures cost this attempt, not the batch
+                print(f"A network error occurred: {e}\nDeparture: {origin}. Destination: {destination}")
+            # Back off outside the semaphore/limiter so other requests can proceed
+            await asyncio.sleep(retry_delay)
+        print(f"Giving up after {MAX_RETRIES} attempts. Departure: {origin}. Destination: {destination}")
+        return None
+
+    @staticmethod
+    def _cache_key(origin, destination, departure_date, adults):
+        """
+        Builds the shelve key identifying one search.
+
+        Parameters:
+        origin (str): The IATA code for the origin city/airport.
+        destination (str): The IATA code for the destination city/airport.
+        departure_date (str): The departure date in the format 'YYYY-MM-DD'.
+        adults (int): The number of adult passengers.
+
+        Returns:
+        str: The cache key.
+        """
+        return f"{origin}:{destination}:{departure_date}:{adults}"
+
+    def _cache_get(self, key):
+        """
+        Returns the cached rows for a search key, or None when absent or stale.
+
+        Parameters:
+        key (str): The cache key built by _cache_key.
+
+        Returns:
+        list or None: The cached rows if still fresh, otherwise None.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        cached_at, rows = entry
+        if time.time() - cached_at > CACHE_TTL:
+            return None
+        return rows
+
+    def _cache_put(self, key, rows):
+        """
+        Stores the rows of a completed search under the given key.
+
+        Parameters:
+        key (str): The cache key built by _cache_key.
+        rows (list): The filtered offer rows (may be empty; failures are not cached).
+        """
+        self._cache[key] = (time.time(), rows)
+
+    def _parse_offers(self, raw):
+        """
+        Lazily parses a raw flight-offers response and returns its offer list.
+
+        simdjson only materializes the fields that are actually read, so the
+        parts of each offer this pipeline never touches (fareDetailsBySegment,
+        travelerPricings, ...) cost neither CPU nor allocations.
+
+        Parameters:
+        raw (bytes): The raw JSON response body.
+
+        Returns:
+        simdjson.Array or list: The lazy list of offers, empty if 'data' is absent.
+        """
+        document = self._json_parser.parse(raw)
+        try:
+            return document['data']
+        except KeyError:
+            return []
+
     @staticmethod
-    def _add_offers_to_df(df, offer_lst, max_price):
+    def _offers_to_rows(offer_lst, max_price):
         """
-        Processes a list of flight offers and adds relevant data to a DataFrame.
+        Processes a list of flight offers into OfferRow records.
+
+        Each field of an offer is read exactly once and goes straight into a
+        fixed-slot OfferRow, so no per-offer dicts are built or mutated.
 
         Parameters:
-        df (pandas.DataFrame): The DataFrame to which flight offers will be added.
         offer_lst (list): A list of flight offers returned by the Amadeus API.
         max_price (float): The maximum price threshold for filtering flight offers.
 
         Returns:
-        pandas.DataFrame: The updated DataFrame containing the filtered flight offers.
+        list: A list of OfferRow records, one per filtered flight offer.
         """
+        rows = []
         for offer in offer_lst:
             itinerary = offer['itineraries'][0]
-            total_price = offer['price']['total'] # Price
             try:
-                total_price = float(total_price)
+                total_price = float(offer['price']['total']) # Price
             except ValueError:
                 continue
             if total_price > max_price:
                 continue
-            currency = offer['price']['currency'] # Currency
-            total_duration = itinerary['duration'] # Total duration
 
             segments = itinerary['segments']  # Segments
             num_of_stops = len(segments) - 1 # Number of stops
             if num_of_stops > 1:
                 continue
 
-            date_depart = segments[0]['departure']['at']
-            iata0_depart = segments[0]['departure']['iataCode'] # Departure city
-            iata0_arrive = segments[0]['arrival']['iataCode']
-            segment0_duration = segments[0]['duration']
-
-            offer_to_add = {
-                'Currency': currency,
-                'Price': total_price,
-                'Date': date_depart,
-                'Stops': num_of_stops,
-                'IATA_Origin': iata0_depart,
-                'IATA_Destination': iata0_arrive,
-                'Duration': segment0_duration,
-                'IATA1_Origin': '',
-                'IATA1_Destination': '',
-                'Duration1': '',
-                'Total_Duration': total_duration,
-            }
-
+            segment0 = segments[0]
+            departure0 = segment0['departure']
             if num_of_stops > 0:
-                iata1_depart = segments[1]['departure']['iataCode']  # Departure city
-                iata1_arrive = segments[1]['arrival']['iataCode']
-                segment1_duration = segments[1]['duration']
-
-                offer_to_add['IATA1_Origin'] = iata1_depart
-                offer_to_add['IATA1_Destination'] = iata1_arrive
-                offer_to_add['Duration1'] = segment1_duration
+                segment1 = segments[1]
+                iata1_depart = segment1['departure']['iataCode']  # Departure city
+                iata1_arrive = segment1['arrival']['iataCode']
+                segment1_duration = segment1['duration']
+            else:
+                iata1_depart = iata1_arrive = segment1_duration = ''
 
-            df = pd.concat([df, pd.DataFrame([offer_to_add])], ignore_index=True)
-        return df
\ No newline at end of file
+            rows.append(OfferRow(
+                offer['price']['currency'],     # Currency
+                total_price,
+                departure0['at'],               # Date
+                num_of_stops,
+                departure0['iataCode'],         # Departure city
+                segment0['arrival']['iataCode'],
+                segment0['duration'],
+                iata1_depart,
+                iata1_arrive,
+                segment1_duration,
+                itinerary['duration'],          # Total duration
+            ))
+        return rows
\ No newline at end of file
@@ -1,8 +1,48 @@
 import os
-import json
+import re
+import functools
+import orjson
 import pandas as pd
 import numpy as np
 
+from amadeusOperator import COLUMNS
+
+_DURATION_RE = re.compile(r'^P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?')
+
+DTYPES = {
+    'Currency': 'string[pyarrow]',
+    'Price': 'float32[pyarrow]',
+    'Date': 'string[pyarrow]',
+    'Stops': 'int8[pyarrow]',
+    'IATA_Origin': 'string[pyarrow]',
+    'IATA_Destination': 'string[pyarrow]',
+    'Duration': 'string[pyarrow]',
+    'IATA1_Origin': 'string[pyarrow]',
+    'IATA1_Destination': 'string[pyarrow]',
+    'Duration1': 'string[pyarrow]',
+    'Total_Duration': 'string[pyarrow]',
+}
+# Categorized after the read: asking the reader for 'category' directly fails
+# on columns that are entirely null (e.g. IATA1_* when every flight is nonstop)
+CATEGORICAL_COLUMNS = ('IATA_Origin', 'IATA_Destination', 'IATA1_Origin', 'IATA1_Destination')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_iata_city_codes(jsonfilepath):
+    """
+    Load iata-city json, caching the parsed dict per path
+
+    The file is immutable for the life of the program, so repeated calls
+    reuse the first parse instead of re-reading the file.
+
+    Parameters:
+    jsonfilepath (str): path of json file
+    """
+    with open(jsonfilepath, 'rb') as file:
+        airport_city = orjson.loads(file.read())
+    return airport_city
+
+
 class FlightOfferProcessor:
     """
     A class to process flight offers and store the data in a DataFrame.
@@ -27,7 +67,10 @@ class FlightOfferProcessor:
         If the file is not found, returns None and prints an error message.
         """
         try:
-            df = pd.read_csv(self.filepath)
+            df = pd.read_csv(self.filepath, engine='pyarrow',
+                             dtype=DTYPES, names=list(COLUMNS), header=None)
+            for col in CATEGORICAL_COLUMNS:
+                df[col] = df[col].astype('category')
             return df
         except FileNotFoundError:
             print(f"Error: The file '{self.filepath}' does not exist.")
@@ -38,14 +81,12 @@ class FlightOfferProcessor:
         Processes the DataFrame by applying a series of transformations and updates.
 
         This method performs several steps on the DataFrame `df`:
-        1. Adds headers to the DataFrame.
-        2. Maps IATA codes to city names.
-        3. Processes and formats duration information.
-        4. Formats dates.
-        5. Calculates stop durations.
-        6. Converts prices from EUR to ILS.
-        7. Rounds prices to a standard format.
-        8. Reorders the columns in the DataFrame.
+        1. Maps IATA codes to city names.
+        2. Processes duration information and calculates stop durations.
+        3. Formats dates.
+        4. Converts prices from EUR to ILS.
+        5. Rounds prices to a standard format.
+        6. Reorders the columns in the DataFrame.
 
         Returns:
         None
@@ -53,27 +94,20 @@ class FlightOfferProcessor:
         if self.df is None:
             print("Warning: No DataFrame available. Processing cannot proceed.")
             return
-        self.add_header()
         self.iata2city()
         self.process_duration()
         self.format_date()
-        self.get_stop_duration()
         self.eur2ils()
         self.round_price()
         self.reorder_columns()
         pass
 
-    def add_header(self):
-        """
-        Adds header to the DataFrame
-        """
-        self.df.columns = ['Currency', 'Price', 'Date', 'Stops', 'IATA_Origin', 'IATA_Destination',
-                      'Duration', 'IATA1_Origin', 'IATA1_Destination', 'Duration1',
-                      'Total_Duration']
-
     def iata2city(self):
         """
         Maps IATA code to the correspondent city name
+
+        The IATA columns arrive from read_file as categoricals, so the mapping
+        is applied once per unique code rather than once per row.
         """
         iata_city = self._get_iata_city_code()
         self.df['City_Origin'] = self.df['IATA_Origin'].map(iata_city)
@@ -84,78 +118,115 @@ class FlightOfferProcessor:
 
     def process_duration(self):
         """
-        Converts the Duration format into 'HH:MM'
-        """
-        self.df['Duration'] = self._format_duration(self.df['Duration'])
-        self.df['Duration1'] = self._format_duration(self.df['Duration1'])
-        self.df['Total_Duration'] = self._format_duration(self.df['Total_Duration'])
+        Converts the Duration format into 'HH:MM' and calculates the stop's duration
+
+        The three duration columns are parsed into whole minutes once, the
+        stop duration is derived by integer subtraction, and all four columns
+        are formatted into 'HH:MM' at the end.
+        """
+        duration = self._parse_iso_duration(self.df['Duration'])
+        duration1 = self._parse_iso_duration(self.df['Duration1'])
+        total_duration = self._parse_iso_duration(self.df['Total_Duration'])
+        stop_duration = total_duration - duration - duration1
+        stop_duration[(duration < 0) | (duration1 < 0) | (total_duration < 0)] = -1
+        self.df['Duration'] = self._format_duration(duration)
+        self.df['Duration1'] = self._format_duration(duration1)
+        self.df['Total_Duration'] = self._format_duration(total_duration)
+        self.df['Stop_Duration'] = self._format_duration(stop_duration)
         pass
 
-    def get_stop_duration(self):
-        """
-        Calculates the stop's duration
+    @staticmethod
+    def _parse_iso_duration(duration_series):
         """
-        self.df['Stop_Duration'] =\
-            (pd.to_timedelta(self.df['Total_Duration'] + ':00') -
-             pd.to_timedelta(self.df['Duration'] + ':00') -
-             pd.to_timedelta(self.df['Duration1'] + ':00'))
-        self.df['Stop_Duration'] = self._format_duration(self.df['Stop_Duration'])
-        pass
+        Parses pd.Series of ISO 8601 durations into whole minutes
+
+        Amadeus durations follow the narrow grammar 'P<d>DT<h>H<m>M' with every
+        part optional, so one compiled-regex extraction plus integer math
+        replaces pd.to_timedelta's per-element dispatch.
+
+        Parameters:
+        duration_series (pandas.Series): A series of duration strings in ISO 8601 format (e.g., 'PT9H45M').
+
+        Returns:
+        numpy.ndarray: Durations as int64 minutes, with -1 marking missing values.
+        """
+        parts = duration_series.str.extract(_DURATION_RE)
+        days = pd.to_numeric(parts[0], errors='coerce')
+        hours = pd.to_numeric(parts[1], errors='coerce')
+        minutes = pd.to_numeric(parts[2], errors='coerce')
+        missing = (days.isna() & hours.isna() & minutes.isna()).to_numpy()
+        total_minutes = (days.fillna(0).to_numpy(dtype='int64') * 1440 +
+                         hours.fillna(0).to_numpy(dtype='int64') * 60 +
+                         minutes.fillna(0).to_numpy(dtype='int64'))
+        total_minutes[missing] = -1
+        return total_minutes
 
     @staticmethod
-    def _format_duration(duration_series):
+    def _format_duration(duration_minutes):
         """
-        Converts pd.Series of Duration into 'HH:MM'
+        Converts an array of whole minutes into 'HH:MM'
 
         Parameters:
-        duration_series (pandas.Series): A series of duration strings in ISO 8601 format (e.g., 'PT9H45M').
+        duration_minutes (numpy.ndarray): Durations as int64 minutes, with -1 marking missing values.
 
         Returns:
-        pandas.Series: A series of formatted duration strings in 'HH:MM' format.
+        numpy.ndarray: Formatted 'HH:MM' strings, with NaN for missing values.
         """
-        timedeltas = pd.to_timedelta(duration_series)
-        formatted_series = timedeltas.apply(
-            lambda x: f'{x.components.days * 24 + x.components.hours:02}:{x.components.minutes:02}'
-            if pd.notnull(x) else np.nan
+        valid = duration_minutes >= 0
+        hours, minutes = np.divmod(np.where(valid, duration_minutes, 0), 60)
+        formatted = np.char.add(
+            np.char.zfill(hours.astype(str), 2),
+            np.char.add(':', np.char.zfill(minutes.astype(str), 2))
         )
-        return formatted_series
+        return np.where(valid, formatted.astype(object), np.nan)
 
     @staticmethod
     def _get_iata_city_code(jsonfilepath='iata_codes.json'):
         """
-        Load iata-city json
+        Load iata-city json (cached after the first call per path)
 
         Parameters:
         jsonfilepath (str): path of json file
         """
-        with open(jsonfilepath) as file:
-            airport_city = json.load(file)
-        return airport_city
+        return _load_iata_city_codes(jsonfilepath)
 
     def format_date(self):
         """
         Format the date into 'YY-mm-dd HH-MM' format
+
+        The Amadeus API already delivers ISO-8601 timestamps, so the parse
+        takes the vectorized format='ISO8601' fastpath; cache=True reuses the
+        result for repeated identical timestamps.
         """
-        self.df['Date'] = pd.to_datetime(self.df['Date']).dt.strftime('%Y-%m-%d %H:%M')
+        self.df['Date'] = pd.to_datetime(self.df['Date'], format='ISO8601',
+                                         cache=True).dt.strftime('%Y-%m-%d %H:%M')
         pass
 
     def round_price(self):
         """
-        Round the prices
+        Round the prices to whole shekels
+
+        The converted ILS prices are integer-valued, so they are cast to
+        int32 rather than kept as float64 with a trailing '.0' in the CSV.
         """
-        self.df['Price'] = self.df['Price'].round()
+        self.df['Price'] = np.rint(self.df['Price'].to_numpy()).astype('int32')
         pass
 
     def eur2ils(self):
         """
         Convert EUR to ILS
+
+        Only the EUR rows are converted, so mixed-currency data keeps its
+        other currencies untouched instead of aborting the whole conversion.
         """
-        if not self.df['Currency'].eq('EUR').all():
-            print("Not all prices are in EUR!!!")
-        else:
-            exchange_rate = 4.14
-            self.df['Price'] = self.df['Price'] * exchange_rate
-            self.df['Currency'] = 'ILS'
+        exchange_rate = 4.14
+        mask = self.df['Currency'].to_numpy() == 'EUR'
+        prices = self.df['Price'].to_numpy()
+        self.df['Price'] = np.where(mask, prices * exchange_rate, prices)
+        self.df.loc[mask, 'Currency'] = 'ILS'
+        # Categorize only now that the values are final; the column holds
+        # 2-3 unique currencies, so this stores each string once
+        self.df['Currency'] = self.df['Currency'].astype('category')
 
     def reorder_columns(self):
         """
@@ -164,7 +235,7 @@ class FlightOfferProcessor:
         new_order = ['Currency', 'Price', 'Date', 'Stops', 'Total_Duration', 'Stop_Duration',
                      'City_Origin','IATA_Origin', 'City_Destination', 'IATA_Destination', 'Duration',
                      'IATA1_Destination', 'City1_Destination', 'Duration1']
-        self.df = self.df[new_order]
+        self.df = self.df.reindex(columns=new_order, copy=False)
         pass
 
     def save_csv(self, filepath):